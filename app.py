@@ -3,9 +3,15 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+from statistics import NormalDist
+from typing import Dict, List, Tuple
 
-@dataclass
+# Units, revenue and costs are stored as float32 to halve memory; profit and ROI stay
+# float64 because profit is a small difference of large amounts
+SIMULATION_DTYPE = np.float32
+
+@dataclass(frozen=True, slots=True)
 class BusinessParams:
     units_base: float
     units_std: float
@@ -19,150 +25,144 @@ class BusinessParams:
     employee_salary: float
 
 def calculate_total_revenue(units: float, params: BusinessParams) -> dict:
-    base_revenue = units * params.price_per_unit
-    subscription_revenue = units * params.subscription_rate
-    addon_revenue = units * params.addon_rate
-    total = base_revenue + subscription_revenue + addon_revenue
+    rev_per_unit, _, _ = _derived(params)
     
     return {
-        'base': base_revenue,
-        'subscription': subscription_revenue,
-        'addons': addon_revenue,
-        'total': total
+        'base': units * params.price_per_unit,
+        'subscription': units * params.subscription_rate,
+        'addons': units * params.addon_rate,
+        'total': units * rev_per_unit
     }
 
 def calculate_total_costs(units: float, params: BusinessParams) -> dict:
-    employee_costs = params.num_employees * params.employee_salary
-    fixed_costs = params.fixed_costs + employee_costs
-    variable_costs = units * params.variable_cost_per_unit
-    total = fixed_costs + variable_costs + params.non_recurring_costs
+    _, _, fixed_total = _derived(params)
     
     return {
-        'fixed': fixed_costs,
-        'variable': variable_costs,
+        'fixed': params.fixed_costs + (params.num_employees * params.employee_salary),
+        'variable': units * params.variable_cost_per_unit,
         'non_recurring': params.non_recurring_costs,
-        'total': total
+        'total': fixed_total + units * params.variable_cost_per_unit
     }
 
-def run_simulation(params: BusinessParams, num_simulations: int = 1000) -> Tuple[pd.DataFrame, dict]:
-    results = []
-    
-    for _ in range(num_simulations):
-        # Simulate units sold with normal distribution
-        units = max(0, np.random.normal(params.units_base, params.units_std))
-        
-        # Calculate revenues and costs
-        revenue = calculate_total_revenue(units, params)
-        costs = calculate_total_costs(units, params)
-        
-        # Calculate profit and ROI
-        profit = revenue['total'] - costs['total']
-        roi = (profit / costs['total']) * 100 if costs['total'] > 0 else 0
-        
-        results.append({
-            'Units': units,
-            'Revenue': revenue['total'],
-            'Costs': costs['total'],
-            'Profit': profit,
-            'ROI': roi
-        })
+@lru_cache(maxsize=64)
+def _derived(params: BusinessParams) -> Tuple[float, float, float]:
+    # Returns (revenue per unit, contribution per unit, fixed + non-recurring costs)
+    rev_per_unit = params.price_per_unit + params.subscription_rate + params.addon_rate
+    fixed_total = params.fixed_costs + params.non_recurring_costs + (params.num_employees * params.employee_salary)
+    return rev_per_unit, rev_per_unit - params.variable_cost_per_unit, fixed_total
+
+def _totals(units: np.ndarray, params: BusinessParams) -> Tuple[np.ndarray, np.ndarray]:
+    # Total revenue and costs only, without the per-stream breakdown dicts
+    rev_per_unit, _, fixed_total = _derived(params)
+    scalar = units.dtype.type
+    revenue = units * scalar(rev_per_unit)
+    costs = units * scalar(params.variable_cost_per_unit)
+    costs += scalar(fixed_total)
+    return revenue, costs
+
+def _units_distribution(params: BusinessParams) -> Tuple[float, float, float]:
+    # Units sold are max(0, N(base, std)); returns the exact (mean, 10th, 90th percentile)
+    mu, sigma = params.units_base, params.units_std
+    if sigma <= 0:
+        units = max(0.0, mu)
+        return units, units, units
     
-    df = pd.DataFrame(results)
+    z = mu / sigma
+    mean = mu * NormalDist().cdf(z) + sigma * NormalDist().pdf(z)
+    dist = NormalDist(mu, sigma)
+    return mean, max(0.0, dist.inv_cdf(0.1)), max(0.0, dist.inv_cdf(0.9))
+
+def calculate_metrics(params: BusinessParams) -> dict:
+    _, unit_contribution, fixed_total = _derived(params)
     
     # Calculate breakeven units
-    unit_contribution = params.price_per_unit + params.subscription_rate + params.addon_rate - params.variable_cost_per_unit
-    fixed_and_nonrecurring = params.fixed_costs + params.non_recurring_costs + (params.num_employees * params.employee_salary)
-    breakeven_units = fixed_and_nonrecurring / unit_contribution if unit_contribution > 0 else float('inf')
+    breakeven_units = fixed_total / unit_contribution if unit_contribution > 0 else float('inf')
+    
+    # Profit is monotone in units, so the scenarios follow directly from the units distribution
+    units_mean, units_q10, units_q90 = _units_distribution(params)
+    profit_q10 = units_q10 * unit_contribution - fixed_total
+    profit_q90 = units_q90 * unit_contribution - fixed_total
     
     metrics = {
         'breakeven_units': breakeven_units,
-        'poor_case': df['Profit'].quantile(0.1),
-        'average_case': df['Profit'].mean(),
-        'good_case': df['Profit'].quantile(0.9)
+        'poor_case': min(profit_q10, profit_q90),
+        'average_case': units_mean * unit_contribution - fixed_total,
+        'good_case': max(profit_q10, profit_q90)
     }
     
-    return df, metrics
+    return metrics
 
-def format_currency(value: float) -> str:
+@st.cache_data(max_entries=32, show_spinner=False)
+def run_simulation(params: BusinessParams, num_simulations: int = 1000, seed: int = 0) -> Dict[str, np.ndarray]:
+    # Simulate units sold with normal distribution
+    units = np.random.default_rng(seed).standard_normal(num_simulations, dtype=SIMULATION_DTYPE)
+    units *= SIMULATION_DTYPE(params.units_std)
+    units += SIMULATION_DTYPE(params.units_base)
+    np.maximum(units, SIMULATION_DTYPE(0.0), out=units)
+    
+    # Calculate revenues and costs
+    revenue, costs = _totals(units, params)
+    
+    # Calculate profit from the unit contribution in float64; subtracting the rounded
+    # float32 revenue and costs would lose most of its precision when they're close
+    _, unit_contribution, fixed_total = _derived(params)
+    profit = units.astype(np.float64)
+    profit *= unit_contribution
+    profit -= fixed_total
+    roi = np.zeros_like(profit)
+    np.divide(profit, costs, out=roi, where=costs > 0)
+    roi *= 100
+    
+    arrays = {
+        'Units': units,
+        'Revenue': revenue,
+        'Costs': costs,
+        'Profit': profit,
+        'ROI': roi
+    }
+    
+    return arrays
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def describe_results(arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    # Same table as DataFrame.describe(), with all quantiles of a column taken in one np.quantile call
+    stats = {}
+    for name, values in arrays.items():
+        q = np.quantile(values, [0, 0.25, 0.5, 0.75, 1])
+        stats[name] = {
+            'count': len(values),
+            'mean': values.mean(dtype=np.float64),
+            'std': values.std(ddof=1, dtype=np.float64),
+            'min': q[0],
+            '25%': q[1],
+            '50%': q[2],
+            '75%': q[3],
+            'max': q[4]
+        }
+    return pd.DataFrame(stats).round(2)
+
+@lru_cache(maxsize=256)
+def _format_currency(value: float) -> str:
     return f"${value:,.2f}"
 
-def main():
-    st.set_page_config(layout="wide")
-    st.title('Business Monte Carlo Simulation')
-    st.markdown("""
-    This simulation helps estimate potential business outcomes based on your inputs.
-    Adjust the parameters in the sidebar to see how they affect your business metrics.
-    """)
-    
-    with st.sidebar:
-        st.header('Input Parameters')
-        
-        # Base unit parameters
-        st.subheader('🛍️ Sales Parameters')
-        col1, col2 = st.columns(2)
-        with col1:
-            units_base = st.number_input('Expected Units', min_value=1, max_value=10000, value=100)
-        with col2:
-            units_std = st.number_input('Units Variation (±)', min_value=0.0, max_value=100.0, value=10.0,
-                                      help="Standard deviation in units sold")
-        
-        price_per_unit = st.number_input('Base Price per Unit ($)', min_value=0.01, value=100.00, step=0.01,
-                                        help="One-time purchase price per unit")
-        
-        # Revenue streams
-        st.subheader('💰 Additional Revenue')
-        subscription_rate = st.number_input('Annual Subscription ($)', min_value=0.0, value=50.0, step=0.01,
-                                          help="Annual recurring revenue per unit")
-        addon_rate = st.number_input('Annual Add-ons ($)', min_value=0.0, value=25.0, step=0.01,
-                                    help="Expected annual add-on revenue per unit")
-        
-        # Costs
-        st.subheader('💼 Business Costs')
-        fixed_costs = st.number_input('Fixed Costs / Year ($)', min_value=0.0, value=50000.0, step=100.0,
-                                     help="Annual fixed costs excluding salaries")
-        variable_cost_per_unit = st.number_input('Cost per Unit ($)', min_value=0.0, value=40.0, step=0.01,
-                                                help="Variable cost per unit sold")
-        non_recurring_costs = st.number_input('One-time Costs ($)', min_value=0.0, value=10000.0, step=100.0,
-                                            help="Non-recurring setup or initial costs")
-        
-        # Employee costs
-        st.subheader('👥 Employee Costs')
-        col3, col4 = st.columns(2)
-        with col3:
-            num_employees = st.number_input('Employees', min_value=0, value=2, step=1)
-        with col4:
-            employee_salary = st.number_input('Salary / Year ($)', min_value=0.0, value=50000.0, step=1000.0)
-        
-        # Simulation parameters
-        st.subheader('🎲 Simulation Settings')
-        num_simulations = st.slider('Number of Simulations', 100, 10000, 1000)
+def format_currency(value: float) -> str:
+    # -0.0 and 0.0 share a cache key, so normalize the sign before formatting
+    return _format_currency(value + 0.0)
 
-    # Create parameters object
-    params = BusinessParams(
-        units_base=units_base,
-        units_std=units_std,
-        price_per_unit=price_per_unit,
-        subscription_rate=subscription_rate,
-        addon_rate=addon_rate,
-        fixed_costs=fixed_costs,
-        variable_cost_per_unit=variable_cost_per_unit,
-        non_recurring_costs=non_recurring_costs,
-        num_employees=num_employees,
-        employee_salary=employee_salary
-    )
-    
-    # Run simulation
-    df, metrics = run_simulation(params, num_simulations)
+@st.fragment
+def render_results():
+    params, arrays, metrics = st.session_state.results
     
     # Display results in three columns
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.subheader('📊 Revenue Breakdown (Per Unit)')
+        rev_per_unit, _, _ = _derived(params)
         base_rev = format_currency(params.price_per_unit)
         sub_rev = format_currency(params.subscription_rate)
         addon_rev = format_currency(params.addon_rate)
-        total_rev = format_currency(params.price_per_unit + params.subscription_rate + params.addon_rate)
+        total_rev = format_currency(rev_per_unit)
         
         st.info(f"""
         Base Price: {base_rev}
@@ -186,23 +186,118 @@ def main():
     
     # Create visualization
     st.subheader('📊 Profit Distribution')
-    fig = go.Figure()
-    fig.add_trace(go.Histogram(
-        x=df['Profit'],
-        nbinsx=50,
-        marker_color='#2E86C1'
-    ))
-    fig.update_layout(
-        title='Distribution of Potential Annual Profits',
-        xaxis_title='Profit ($)',
-        yaxis_title='Frequency',
-        showlegend=False
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    profit = arrays['Profit']
+    if profit.size < 2 or profit.min() == profit.max():
+        # Every run gives the same profit (e.g. no units variation), so there's nothing to bin
+        st.metric('Profit (deterministic)', format_currency(float(profit[0])))
+    else:
+        # Build the figure once per session and only swap in new data on reruns
+        if 'profit_fig' not in st.session_state:
+            fig = go.Figure()
+            fig.add_trace(go.Bar(
+                marker_color='#2E86C1'
+            ))
+            fig.update_layout(
+                title='Distribution of Potential Annual Profits',
+                xaxis_title='Profit ($)',
+                yaxis_title='Frequency',
+                showlegend=False,
+                bargap=0
+            )
+            st.session_state.profit_fig = fig
+        fig = st.session_state.profit_fig
+        
+        # Bin on the server so only the bin counts are sent to the browser
+        counts, edges = np.histogram(profit, bins=50)
+        fig.data[0].x = 0.5 * (edges[:-1] + edges[1:])
+        fig.data[0].y = counts
+        fig.data[0].width = edges[1] - edges[0]
+        st.plotly_chart(fig, use_container_width=True)
     
     # Show detailed statistics in an expandable section
     with st.expander("Show Detailed Statistics"):
-        st.dataframe(df.describe().round(2))
+        st.dataframe(describe_results(arrays))
+
+def main():
+    st.set_page_config(layout="wide")
+    st.title('Business Monte Carlo Simulation')
+    st.markdown("""
+    This simulation helps estimate potential business outcomes based on your inputs.
+    Adjust the parameters in the sidebar to see how they affect your business metrics.
+    """)
+    
+    with st.sidebar:
+        st.header('Input Parameters')
+        
+        with st.form('params', clear_on_submit=False):
+            # Base unit parameters
+            st.subheader('🛍️ Sales Parameters')
+            col1, col2 = st.columns(2)
+            with col1:
+                units_base = st.number_input('Expected Units', min_value=1, max_value=10000, value=100)
+            with col2:
+                units_std = st.number_input('Units Variation (±)', min_value=0.0, max_value=100.0, value=10.0,
+                                          help="Standard deviation in units sold")
+            
+            price_per_unit = st.number_input('Base Price per Unit ($)', min_value=0.01, value=100.00, step=0.01,
+                                            help="One-time purchase price per unit")
+            
+            # Revenue streams
+            st.subheader('💰 Additional Revenue')
+            subscription_rate = st.number_input('Annual Subscription ($)', min_value=0.0, value=50.0, step=0.01,
+                                              help="Annual recurring revenue per unit")
+            addon_rate = st.number_input('Annual Add-ons ($)', min_value=0.0, value=25.0, step=0.01,
+                                        help="Expected annual add-on revenue per unit")
+            
+            # Costs
+            st.subheader('💼 Business Costs')
+            fixed_costs = st.number_input('Fixed Costs / Year ($)', min_value=0.0, value=50000.0, step=100.0,
+                                         help="Annual fixed costs excluding salaries")
+            variable_cost_per_unit = st.number_input('Cost per Unit ($)', min_value=0.0, value=40.0, step=0.01,
+                                                    help="Variable cost per unit sold")
+            non_recurring_costs = st.number_input('One-time Costs ($)', min_value=0.0, value=10000.0, step=100.0,
+                                                help="Non-recurring setup or initial costs")
+            
+            # Employee costs
+            st.subheader('👥 Employee Costs')
+            col3, col4 = st.columns(2)
+            with col3:
+                num_employees = st.number_input('Employees', min_value=0, value=2, step=1)
+            with col4:
+                employee_salary = st.number_input('Salary / Year ($)', min_value=0.0, value=50000.0, step=1000.0)
+            
+            # Simulation parameters
+            st.subheader('🎲 Simulation Settings')
+            num_simulations = st.slider('Number of Simulations', 100, 10000, 1000)
+            submitted = st.form_submit_button('Run Simulation')
+        
+        if 'seed' not in st.session_state:
+            st.session_state.seed = 0
+        reseeded = st.button('Reseed', help="Draw a fresh set of random samples")
+        if reseeded:
+            st.session_state.seed += 1
+
+    # Create parameters object
+    params = BusinessParams(
+        units_base=units_base,
+        units_std=units_std,
+        price_per_unit=price_per_unit,
+        subscription_rate=subscription_rate,
+        addon_rate=addon_rate,
+        fixed_costs=fixed_costs,
+        variable_cost_per_unit=variable_cost_per_unit,
+        non_recurring_costs=non_recurring_costs,
+        num_employees=num_employees,
+        employee_salary=employee_salary
+    )
+    
+    # Run simulation (cached on the input values and seed) only when the inputs are submitted
+    if submitted or reseeded or 'results' not in st.session_state:
+        arrays = run_simulation(params, num_simulations, st.session_state.seed)
+        metrics = calculate_metrics(params)
+        st.session_state.results = (params, arrays, metrics)
+    
+    render_results()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file